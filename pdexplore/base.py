@@ -1,7 +1,6 @@
 """Base classes for pdexplore."""
 
 import abc
-import inspect
 
 from .util import (
     # custom_print as print,
@@ -29,19 +28,30 @@ class Exploration(abc.ABC):
     ----------
     """
 
-    @property
-    def name(self):
-        return str(type(self))
+    _preconditions = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the name is a plain class attribute, not computed on every access
+        if 'name' not in vars(cls):
+            cls.name = cls.__name__
+        # precondition methods are collected once per class, rather than on
+        # every application; those of base classes come first
+        preconditions = {}
+        for klass in reversed(cls.__mro__):
+            for attr_name, attr in vars(klass).items():
+                if getattr(attr, 'precondition', False):
+                    preconditions[attr_name] = attr
+                else:
+                    preconditions.pop(attr_name, None)
+        cls._preconditions = tuple(preconditions.values())
 
     def _preconditions_hold(self, srs):  # pylint: disable=R0201,W0613
         """Returns True if this method can be applied to a given series."""
-        methods = inspect.getmembers(self, predicate=inspect.ismethod)
-        for method_tup in methods:
-            method_name, method = method_tup
-            if hasattr(method, 'precondition'):
-                if not method(srs):
-                    comment(f"{self.name} skipped. Reason: {method.fail_msg}.")
-                    return False
+        for method in self._preconditions:
+            if not method(self, srs):
+                comment(f"{self.name} skipped. Reason: {method.fail_msg}.")
+                return False
         return True
 
     @abc.abstractmethod
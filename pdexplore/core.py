@@ -1,24 +1,123 @@
 """Core functionalities for pdexplore."""
 
-from .numeric import run_numeric_exploration_pipeline
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .numeric import (
+    is_fast_mode,
+    set_fast_mode,
+    is_numeric_dtype,
+    precompute_numeric_stats,
+    run_numeric_exploration_pipeline,
+)
 from .general import general_exploration
+from .stats import std
 from .util import (
     get_output_fpath,
     OUTPUT_F,
     set_printing_to_screen,
     set_output_f,
+    set_output_buffer,
+    replay,
+    batched_output,
     custom_print as print,
     # comment,
     # bold,
 )
 
 
-def _explore_series(series, label=None):
-    general_exploration(series, label=label)
-    run_numeric_exploration_pipeline(series)
+def _explore_series(series, label=None, store=None):
+    # every exploration starts from a fresh store, seeded only with the given
+    # precomputed stats, so nothing stale is kept from an earlier exploration
+    series.pdexplore = dict(store or {})
+    # all output for a series is written at once
+    with batched_output():
+        general_exploration(series, label=label)
+        run_numeric_exploration_pipeline(series)
     # _explore_numeric_series(series, count)
 
 
+OUTPUT_FORMATS = ['txt', 'feather']
+
+# columns of the per-column stats table written in the feather output format
+STATS_COLUMNS = [
+    'column', 'mean', 'std', 'min', 'max', 'median', 'mad', 'skew', 'n_na',
+    'n_unique', 'shapiro_p', 'dag_p',
+]
+
+
+def _stats_record(label, series):
+    """Returns the stats gathered by exploring a series, as a flat dict."""
+    store = getattr(series, 'pdexplore', {})
+    record = {'column': str(label)}
+    for col, key in [('n_na', 'count_na'), ('n_unique', 'n_unique'),
+                     ('shapiro_p', 'shapiro_pval'), ('dag_p', 'dag_pval')]:
+        if key in store:
+            record[col] = store[key]
+    # numeric stats are only valid if basic numeric exploration took place
+    if 'skewness' in store:
+        n, mean, m2, _, _, dmin, dmax = store['moments']
+        record.update({
+            'mean': mean,
+            'std': std(n, m2),
+            'min': dmin,
+            'max': dmax,
+            'median': store['median'],
+            'mad': store['mad'],
+            'skew': store['skewness'],
+        })
+    return record
+
+
+def _explore_series_in_worker(job):
+    """Explores a single column in a worker process, returning its output.
+
+    Columns are sent as a (label, values, store) tuple of the column's array
+    and any precomputed stats, which is much cheaper to pickle than a series.
+    The pandas array, rather than a numpy one, keeps extension dtypes, like
+    that of timezone-aware datetimes, intact.
+    Returns the output records of the exploration and gathered stats.
+    """
+    label, values, store = job
+    series = pd.Series(values, name=label)
+    records = []
+    set_output_buffer(records)
+    try:
+        _explore_series(series=series, label=label, store=store)
+    finally:
+        set_output_buffer(None)
+    return records, _stats_record(label, series)
+
+
+def _n_workers(n_jobs, n_tasks):
+    """Returns the number of worker processes to run n_tasks with."""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        n_jobs = (os.cpu_count() or 1) + 1 + n_jobs
+    # workers beyond the number of tasks would only add start-up costs
+    return max(min(n_jobs, n_tasks), 1)
+
+
+def _explore_to_file(output_path, explore_func, **kwargs):
+    """Runs the given exploration function, writing its output to a file.
+
+    Output is staged in an in-memory buffer and written to the file at once,
+    instead of writing every line of output separately.
+    """
+    buf = io.StringIO()
+    set_output_f(buf)
+    try:
+        explore_func(**kwargs)
+    finally:
+        set_output_f(None)
+        with open(output_path, 'wt+') as out_f:
+            out_f.write(buf.getvalue())
+
+
 def explore_series(series, label=None, output_path=None, silent=False):
     """Perform basic data exploration of a series and prints the results.
 
@@ -41,14 +140,13 @@ def explore_series(series, label=None, output_path=None, silent=False):
     """
     set_printing_to_screen(not silent)
     if output_path is not None:
-        output_path = get_output_fpath(output_path, laebl=label)
-        with open(output_path, 'wt+') as out_f:
-            set_output_f(out_f)
-            _explore_series(
-                df=series,
-                label=label,
-            )
-            set_output_f(None)
+        output_path = get_output_fpath(output_path, label=label)
+        _explore_to_file(
+            output_path=output_path,
+            explore_func=_explore_series,
+            series=series,
+            label=label,
+        )
     else:
         if OUTPUT_F is None and silent:
             raise ValueError(
@@ -56,50 +154,102 @@ def explore_series(series, label=None, output_path=None, silent=False):
                 " silent. That's silly. Terminating."
             )
         _explore_series(
-            df=series,
+            series=series,
             label=label,
         )
 
 
-def _explore_df(df, skip_lbl=None, skip_cond=None):
+def _explore_df(df, skip_lbl=None, skip_cond=None, n_jobs=1):
     if skip_lbl is None:
-        skip_lbl = []
+        skip_lbl = set()
+    elif isinstance(skip_lbl, str):
+        skip_lbl = {skip_lbl}
+    else:
+        try:
+            skip_lbl = set(skip_lbl)
+        except TypeError:
+            # unhashable labels are looked up in the given container as is
+            pass
     if skip_cond is None:
         skip_cond = []
+    elif callable(skip_cond):
+        skip_cond = [skip_cond]
+    else:
+        try:
+            skip_cond = list(skip_cond)
+        except TypeError:
+            skip_cond = []
     print("Starting to explore a dataframe with pdexplore.")
     print(f"The dataframe contains {len(df.columns)} columns.")
     print(f"The dataframe contains {len(df)} rows.")
     skipped = 0
-    if callable(skip_cond):
-        skip_cond = [skip_cond]
-    for col_lbl in df.columns:
+    # a list of (col_lbl, col) pairs, with col set to None for skipped columns
+    plan = []
+    # columns are partitioned by dtype once, so no per-column dtype checks
+    # are needed from here on
+    numeric_flags = [is_numeric_dtype(dtype) for dtype in df.dtypes]
+    numeric_positions = []
+    for pos, col_lbl in enumerate(df.columns):
         col = df[col_lbl]
         try:
-            if col_lbl in skip_lbl:
-                print(f"Skipping exploration of column {col_lbl}!")
-                skipped += 1
-                continue
+            skip = col_lbl in skip_lbl
         except TypeError:
-            pass
-        try:
-            if not any([cond(col) for cond in skip_cond]):
-                _explore_series(
-                    series=col,
-                    label=col_lbl,
-                )
-            else:
+            skip = False
+        if not skip:
+            try:
+                skip = any(cond(col) for cond in skip_cond)
+            except TypeError:
+                pass
+        if skip:
+            plan.append((col_lbl, None))
+            skipped += 1
+        else:
+            plan.append((col_lbl, col))
+            if numeric_flags[pos]:
+                numeric_positions.append(pos)
+    # stats of all numeric columns are computed together, in 2-D reductions
+    num_stats = precompute_numeric_stats(df, numeric_positions)
+    stores = [
+        {'precomputed': {'numeric_dtype': numeric, **num_stats.get(pos, {})}}
+        for pos, numeric in enumerate(numeric_flags)
+    ]
+    stats = []
+    n_jobs = _n_workers(n_jobs, len(plan) - skipped)
+    if n_jobs == 1:
+        for pos, (col_lbl, col) in enumerate(plan):
+            if col is None:
                 print(f"Skipping exploration of column {col_lbl}!")
-                skipped += 1
-        except TypeError:
-            _explore_series(
-                series=col,
-                label=col_lbl,
-            )
+                continue
+            _explore_series(series=col, label=col_lbl, store=stores[pos])
+            stats.append(_stats_record(col_lbl, col))
+    else:
+        jobs = [
+            (col_lbl, col.array, stores[pos])
+            for pos, (col_lbl, col) in enumerate(plan)
+            if col is not None
+        ]
+        # workers may be started afresh (e.g. with spawn), re-importing
+        # modules, so module-level settings are handed over explicitly
+        with ProcessPoolExecutor(
+                max_workers=n_jobs, initializer=set_fast_mode,
+                initargs=(is_fast_mode(),)) as executor:
+            # results are yielded in column order, whatever order workers
+            # finish in, so the report is never scrambled
+            outputs = executor.map(_explore_series_in_worker, jobs)
+            for col_lbl, col in plan:
+                if col is None:
+                    print(f"Skipping exploration of column {col_lbl}!")
+                else:
+                    records, stats_record = next(outputs)
+                    replay(records)
+                    stats.append(stats_record)
     if skipped > 0:
         print(f"Explortaion of {skipped} columns was skipped.")
+    return pd.DataFrame(stats, columns=STATS_COLUMNS)
 
 
-def explore(df, output_path=None, skip_lbl=None, skip_cond=None, silent=False):
+def explore(df, output_path=None, skip_lbl=None, skip_cond=None, silent=False,
+            n_jobs=1, output_format='txt'):
     """Perform basic data exploration of a dataframe and prints the results.
 
     Parameters
@@ -120,17 +270,44 @@ def explore(df, output_path=None, skip_lbl=None, skip_cond=None, silent=False):
         True, series exploration is skipped.
     silent : bool, optional
         If set to True, no output is printed to screen. Defaults to False.
+    n_jobs : int, optional
+        The number of worker processes used to explore columns in parallel.
+        If set to -1, all CPUs are used. Defaults to 1, in which case columns
+        are explored one after the other in the calling process. Value counts
+        plots are only drawn when exploring in the calling process.
+    output_format : str, optional
+        The format of the output file. 'txt', the default, writes the textual
+        exploration output. 'feather' instead writes a table of statistics
+        gathered for each explored column (like its mean, MAD and normality
+        test p-values) in the Feather format, for reuse by downstream code;
+        this requires pyarrow to be installed, and an output path.
     """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unsupported output format {output_format}. Supported formats "
+            f"are {', '.join(OUTPUT_FORMATS)}.")
+    if output_format == 'feather' and output_path is None:
+        raise ValueError(
+            "The feather output format requires an output path to write the "
+            "stats table to.")
     set_printing_to_screen(not silent)
-    if output_path is not None:
+    if output_path is not None and output_format == 'feather':
+        output_path = get_output_fpath(output_path, ext='feather')
+        stats = _explore_df(
+            df=df, skip_lbl=skip_lbl, skip_cond=skip_cond, n_jobs=n_jobs)
+        stats.to_feather(output_path)
+    elif output_path is not None:
         output_path = get_output_fpath(output_path)
-        with open(output_path, 'wt+') as out_f:
-            set_output_f(out_f)
-            _explore_df(df=df, skip_lbl=skip_lbl, skip_cond=skip_cond)
+        _explore_to_file(
+            output_path=output_path,
+            explore_func=_explore_df,
+            df=df, skip_lbl=skip_lbl, skip_cond=skip_cond, n_jobs=n_jobs,
+        )
     else:
         if OUTPUT_F is None and silent:
             raise ValueError(
                 "No output path is given but function is set to"
                 " silent. That's silly. Terminating."
             )
-        _explore_df(df, skip_lbl=skip_lbl, skip_cond=skip_cond)
+        _explore_df(
+            df, skip_lbl=skip_lbl, skip_cond=skip_cond, n_jobs=n_jobs)
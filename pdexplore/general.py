@@ -1,7 +1,9 @@
 """General data explorations."""
 
-import seaborn as sns
-from matplotlib import pyplot as plt
+import multiprocessing
+
+import numpy as np
+import pandas as pd
 
 from .base import (
     SeriesExploration,
@@ -11,38 +13,98 @@ from .util import (
     custom_print as print,
     # comment,
     bold,
+    flush_output,
+    is_printing_to_screen,
 )
 
 
+def _count_values(srs):
+    """Counts the values of the given series.
+
+    Returns
+    -------
+    tuple
+        A (uniques, counts, na_mask) tuple, holding the unique non-null
+        values of the series, the number of occurrences of each, and a
+        boolean mask of its missing values (None if none can be missing).
+    """
+    dtype = srs.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu' and len(srs) > 0:
+        values = srs.to_numpy()
+        vmin = values.min()
+        if int(values.max()) - int(vmin) < len(values):
+            # integers in a small range are counted directly, with no hashing;
+            # offsets of signed integers are computed in place, in a widened
+            # copy, as they may overflow small signed dtypes (unsigned values
+            # never fall below their minimum)
+            if dtype.kind == 'u':
+                offsets = values - vmin
+            else:
+                offsets = values.astype(np.int64)
+                offsets -= vmin
+            counts = np.bincount(offsets.astype(np.intp, copy=False))
+            present = np.flatnonzero(counts)
+            return present.astype(dtype) + vmin, counts[present], None
+    # a single hashing pass yields unique values, missing values and value
+    # counts alike
+    codes, uniques = pd.factorize(srs, sort=False)
+    na_mask = codes == -1
+    valid_codes = codes[~na_mask] if na_mask.any() else codes
+    counts = np.bincount(valid_codes, minlength=len(uniques))
+    return uniques, counts, na_mask
+
+
+def _most_frequent(counts, k):
+    """Returns the positions of the k largest counts, largest first.
+
+    Only a partial sort of the counts is done. All counts tied with the k-th
+    largest one are kept as candidates, in their original order, so ties are
+    broken by position, exactly as a stable full sort would.
+    """
+    if len(counts) == 0:
+        return np.array([], dtype=np.intp)
+    kth = len(counts) - min(k, len(counts))
+    threshold = np.partition(counts, kth)[kth]
+    top = np.flatnonzero(counts >= threshold)
+    return top[np.argsort(-counts[top], kind='stable')][:k]
+
+
 class BasicExploration(SeriesExploration):
 
+    name = "Basic exploration"
+
     def __init__(self, series_label=None):
         self.lbl = series_label
 
-    @property
-    def name(self):
-        return "Basic exploration"
-
     def _explore(self, srs):
         bold(f"\n=================== {self.lbl} =============================")
         print(f"Starting to explore series {self.lbl} with pdexplore.")
         print(f"dtype: {srs.dtype}")
         count = len(srs)
-        unique_vals = srs.unique()
-        print(f"{len(unique_vals):,} unique values over {count:,} entries.")
-        if len(unique_vals) == 1:
-            print(f"The only occuring value is {unique_vals[0]}")
-        count_na = sum(srs.isna())
+        uniques, counts, na_mask = _count_values(srs)
+        count_na = 0 if na_mask is None else int(np.count_nonzero(na_mask))
+        # like Series.unique(), count missing values as a unique value
+        n_unique = len(uniques) + (1 if count_na else 0)
+        print(f"{n_unique:,} unique values over {count:,} entries.")
+        if n_unique == 1:
+            only_val = uniques[0] if len(uniques) else np.nan
+            print(f"The only occuring value is {only_val}")
         print(f"{count_na*100/count:.2f}% missing values ({count_na:,}).")
-        vcounts = srs.value_counts()
-        BasicExploration.save(srs, 'vcounts', vcounts)
+        BasicExploration.save(srs, 'n_unique', n_unique)
+        BasicExploration.save(srs, 'count_na', count_na)
+        # spares numeric explorations another scan for missing values; always
+        # written, with None meaning there are none, so no stale mask is kept
+        BasicExploration.save(
+            srs, 'na_mask', na_mask if count_na else None)
+        # value counts are kept in order of appearance (or of value), as
+        # their consumers either look values up or only need the top few
+        BasicExploration.save(
+            srs, 'vcounts', pd.Series(counts, index=uniques))
 
 
 class ValueCountsPlot(BasicExploration):
 
-    @property
-    def name(self):
-        return "Value counts plot"
+    name = "Value counts plot"
 
     @precondition(fail_msg="Less than two uniqe values")
     def has_atleast_two_unique_values(self, srs):
@@ -52,28 +114,50 @@ class ValueCountsPlot(BasicExploration):
     @precondition(fail_msg="Low frequency of most-frequent value")
     def high_enough_frequency_of_most_frequent_value(self, srs):
         vcounts = srs.pdexplore['vcounts']
-        return vcounts.iloc[0] > 2
+        return vcounts.max() > 2
+
+    @precondition(fail_msg="Output is not printed to screen")
+    def printing_to_screen(self, srs):
+        # no one would see the plot
+        return is_printing_to_screen()
+
+    @precondition(fail_msg="Not running in the main process")
+    def running_in_main_process(self, srs):
+        # matplotlib is not fork-safe, so worker processes never plot
+        return multiprocessing.current_process().name == 'MainProcess'
 
     def _explore(self, srs):
         vcounts = srs.pdexplore['vcounts']
         count = len(srs)
-        vcounts_p = vcounts.reset_index()
-        if len(vcounts) > 10:
-            vcounts_p = vcounts_p[0:10]
-        # building informative index
-        new_index = []
-        for x in vcounts_p['index']:
-            newi = str(x)
-            if len(newi) > 20:
-                newi = f"{newi[:18]}..."
-            newi = f"{newi} ({vcounts[x]*100/count:.2f}%)"
-            new_index.append(newi)
-        vcounts_p['index'] = new_index
+        counts = vcounts.to_numpy()
+        top = _most_frequent(counts, 10)
+        vcounts_p = pd.DataFrame({
+            'index': vcounts.index[top],
+            'count': counts[top],
+        })
+        # building informative index, with percentages computed at once from
+        # the counts already at hand
+        labels = [str(x) for x in vcounts_p['index']]
+        pcts = vcounts_p['count'].to_numpy() * 100 / count
+        vcounts_p['index'] = [
+            f"{lbl if len(lbl) <= 20 else lbl[:18] + '...'} ({pct:.2f}%)"
+            for lbl, pct in zip(labels, pcts)
+        ]
+        # plotting libraries are heavy to import, so they are only imported
+        # once a plot is actually drawn
+        import seaborn as sns
+        from matplotlib import pyplot as plt
+        # each plot is drawn on a figure of its own, closed once shown, so
+        # figures neither pile up in memory nor draw over each other
+        fig, ax = plt.subplots()
         sns.barplot(
             data=vcounts_p, x=vcounts_p.columns[1], y='index',
-            palette='Spectral'
+            palette='Spectral', ax=ax,
         ).set_title(f"10 most frequent values of {self.lbl}")
+        # text output preceding the plot must be shown before it
+        flush_output()
         plt.show()
+        plt.close(fig)
 
 
 GENERAL_EXPLORATIONS_ORDER = [
@@ -1,12 +1,7 @@
 """Numeric explorations for pandas series."""
 
 import numpy as np
-import scipy as sp
-from statsmodels.robust import mad
-from scipy.stats import (
-    skew,
-    skewtest,
-)
+from scipy.stats import shapiro
 
 from .base import (
     SeriesExploration,
@@ -16,73 +11,133 @@ from .util import (
     custom_print as print,
     warning,
 )
+from .stats import (
+    moments,
+    nan_moments_2d,
+    mad,
+    std,
+    skewness,
+    skewtest,
+    normaltest,
+)
 
 
 DEF_ALPHA = 0.05
 
+# the p-value of the Shapiro-Wilk test may be inaccurate for larger samples
+SHAPIRO_MAX_N = 5000
+
+# non-null values are already a NaN-free 1-D array, so the input validation
+# of scipy's axis and NaN policy decorator, if any, is skipped
+_shapiro = getattr(shapiro, '__wrapped__', shapiro)
+
+# if True, normality tests are skipped for series the skewness test has
+# already found not to be normal-like; set to False for the full output
+FAST_MODE = True
+
+
+def set_fast_mode(val):
+    global FAST_MODE
+    FAST_MODE = val
+
+
+def is_fast_mode():
+    return FAST_MODE
+
+
+def is_numeric_dtype(dtype):
+    """Returns True if the given dtype is a numpy real numeric dtype.
+
+    Complex numbers and timedeltas (which numpy counts as integers) have no
+    ordering and moments in the sense numeric explorations assume, so they
+    are not considered numeric.
+    """
+    try:
+        return (np.issubdtype(dtype, np.number)
+                and np.dtype(dtype).kind not in 'cm')
+    except TypeError:  # pandas extension dtypes, like categoricals
+        return False
+
+
+def series_is_numeric(srs):
+    """Returns True if the given series is of a numeric dtype.
+
+    The result is cached in the pdexplore store of the series, so the dtype
+    is checked once per numeric exploration run; dataframe explorations
+    precompute it for all columns at once.
+    """
+    try:
+        return srs.pdexplore['numeric_dtype']
+    except (AttributeError, KeyError):
+        numeric = is_numeric_dtype(srs.dtype)
+        SeriesExploration.save(srs, 'numeric_dtype', numeric)
+        return numeric
+
 
 class _BaseNumericExploration(SeriesExploration):
 
     @precondition(fail_msg="dtype is non-numeric")
     def is_of_numeric_dtype(self, srs):
-        return np.issubdtype(srs.dtype, np.number)
+        return series_is_numeric(srs)
 
 
 class BasicNumericExploration(_BaseNumericExploration):
 
-    @property
-    def name(self):
-        return "Basic numeric exploration"
+    name = "Basic numeric exploration"
 
     @precondition(fail_msg="Less than four non-null values")
     def has_atleast_four_non_null_values(self, srs):
-        nona = srs.dropna()
-        BasicNumericExploration.save(srs, 'nona', nona)
-        return len(nona) >= 4
+        return srs.pdexplore['nona_len'] >= 4
 
     def _explore(self, srs):
-        nona = srs.pdexplore['nona']
+        store = srs.pdexplore
+        # values are only read if their stats were not precomputed
+        if 'moments' not in store:
+            BasicNumericExploration.save(
+                srs, 'moments', moments(store['nona']))
+        n, mean, m2, m3, _, dmin, dmax = store['moments']
+        if 'median' not in store:
+            nona = store['nona']
+            median = np.median(nona)
+            BasicNumericExploration.save(srs, 'median', median)
+            BasicNumericExploration.save(srs, 'mad', mad(nona, median))
         print("\n--- Starting numeric data exploration ---")
-        print(f"Data min={srs.min():,.2f}, max={srs.max():,.2f}.")
-        print(f"Data mean is {srs.mean():,.2f}, std is {srs.std():,.2f}")
+        print(f"Data min={dmin:,.2f}, max={dmax:,.2f}.")
+        print(f"Data mean is {mean:,.2f}, std is {std(n, m2):,.2f}")
         print((
             "It's also usefull to examine the two corresponding outlier-robust"
             " stats:"))
         print((
-            f"Median={srs.median():,.2f}, median absolute deviation "
-            f"(MAD)={mad(nona):,.2f}."))
-        skwns = skew(nona)
+            f"Median={store['median']:,.2f}, median absolute "
+            f"deviation (MAD)={store['mad']:,.2f}."))
+        skwns = skewness(n, m2, m3)
         print((
             f"Data skewness is {skwns:,.2f}. For normally distributed "
             "data, the skewness should be about 0. A skewness value > 0 means "
             "that there is more weight in the left tail of the distribution."))
         BasicNumericExploration.save(srs, 'skewness', skwns)
-        if 'vcounts' not in srs.pdexplore:
-            vcounts = srs.value_counts()
-            BasicNumericExploration.save(srs, 'vcounts', vcounts)
 
 
 class SkewnessTest(_BaseNumericExploration):
 
+    name = "Skewness test"
+
     def __init__(self, alpha=None):
         if alpha is None:
             alpha = DEF_ALPHA
         self.alpha = alpha
 
-    @property
-    def name(self):
-        return "Skewness test"
-
     @precondition(fail_msg="Less than eight non-null values")
     def has_atleast_eight_non_null_values(self, srs):
-        return len(srs.pdexplore['nona']) >= 8
+        return srs.pdexplore['nona_len'] >= 8
 
     def _explore(self, srs):
+        store = srs.pdexplore
         print((
             f"Performing skewness test with α={self.alpha}. H0 is that the "
             "skewness of the population that the sample was drawn from is the"
             "same as that of a corresponding normal distribution."))
-        skew_zscore, skew_pval = skewtest(srs.pdexplore['nona'])
+        skew_zscore, skew_pval = skewtest(store['skewness'], store['nona_len'])
         BasicNumericExploration.save(srs, 'skew_zscore', skew_zscore)
         BasicNumericExploration.save(srs, 'skew_pval', skew_pval)
         print((
@@ -100,27 +155,29 @@ class SkewnessTest(_BaseNumericExploration):
 
 class ShapiroWilkNormalityTest(_BaseNumericExploration):
 
+    name = "Shapiro-Wilk normality test"
+
     def __init__(self, alpha=None):
         if alpha is None:
             alpha = DEF_ALPHA
         self.alpha = alpha
 
-    @property
-    def name(self):
-        return "Shapiro-Wilk normality test"
-
-    @precondition(fail_msg="Less than three non-null values")
+    @precondition(fail_msg="Less than four non-null values")
     def has_atleast_four_non_null_values(self, srs):
-        return len(srs.pdexplore['nona']) >= 4
+        return srs.pdexplore['nona_len'] >= 4
 
-    @precondition(fail_msg="More than 5000 non-null values")
+    @precondition(fail_msg=f"More than {SHAPIRO_MAX_N} non-null values")
     def has_atmost_5000_non_null_values(self, srs):
-        return len(srs.pdexplore['nona']) <= 5000
+        return srs.pdexplore['nona_len'] <= SHAPIRO_MAX_N
+
+    @precondition(fail_msg="Skewness test already rejected normality")
+    def skewness_did_not_reject(self, srs):
+        return not FAST_MODE or srs.pdexplore.get('normal_skewness', True)
 
     def _explore(self, srs):
         print("Performing the Shapiro-Wilk test for normality...")
         print("Null hypothesis (H0): The data comes from a normal dist.")
-        shap_stat, shap_pval = sp.stats.shapiro(srs.pdexplore['nona'])
+        shap_stat, shap_pval = _shapiro(srs.pdexplore['nona'])
         BasicNumericExploration.save(srs, 'shapiro_stat', shap_stat)
         BasicNumericExploration.save(srs, 'shapiro_pval', shap_pval)
         print(f"Test statistic: {shap_stat:.3f} p-value: {shap_pval:.3f}")
@@ -138,23 +195,29 @@ class ShapiroWilkNormalityTest(_BaseNumericExploration):
 
 class DagostinoNormalityTest(_BaseNumericExploration):
 
+    name = "D’Agostino’s K^2 normality test"
+
     def __init__(self, alpha=None):
         if alpha is None:
             alpha = DEF_ALPHA
         self.alpha = alpha
 
-    @property
-    def name(self):
-        return "D’Agostino’s K^2 normality test"
-
     @precondition(fail_msg="Less than eight non-null values")
     def has_atleast_eight_non_null_values(self, srs):
-        return len(srs.pdexplore['nona']) >= 8
+        return srs.pdexplore['nona_len'] >= 8
+
+    @precondition(fail_msg="Skewness test already rejected normality")
+    def skewness_did_not_reject(self, srs):
+        return not FAST_MODE or srs.pdexplore.get('normal_skewness', True)
 
     def _explore(self, srs):
         print("Performing the D’Agostino’s K^2 test for normality...")
         print("Null hypothesis (H0): The data comes from a normal dist.")
-        dag_stat, dag_pval = sp.stats.normaltest(srs.pdexplore['nona'])
+        store = srs.pdexplore
+        n, _, m2, m3, m4, _, _ = store['moments']
+        # reuses the z-score of the skewness test, if it was run
+        dag_stat, dag_pval = normaltest(
+            n, m2, m3, m4, skew_zscore=store.get('skew_zscore'))
         BasicNumericExploration.save(srs, 'dag_stat', dag_stat)
         BasicNumericExploration.save(srs, 'dag_pval', dag_pval)
         print(f"Test statistic: {dag_stat:.3f} p-value: {dag_pval:.3f}")
@@ -248,7 +311,7 @@ SUSPICIOUS_COMPUTING_INT_DICT = [
     },
     # 64-bits
     {
-        "number": -pow(2, 63),
+        "number": -9223372036854775808,
         "equivalent": "-(2^63)",
         "location": "lowest",
         "sign": "a signed",
@@ -256,7 +319,7 @@ SUSPICIOUS_COMPUTING_INT_DICT = [
         "minmax": "min",
     },
     {
-        "number": pow(2, 63) - 1,
+        "number": 9223372036854775807,
         "equivalent": "2^63-1",
         "location": "highest",
         "sign": "a signed",
@@ -264,7 +327,7 @@ SUSPICIOUS_COMPUTING_INT_DICT = [
         "minmax": "max",
     },
     {
-        "number": pow(2, 64) - 1,
+        "number": 18446744073709551615,
         "equivalent": "2^64-1",
         "location": "highest",
         "sign": "an unsigned",
@@ -273,7 +336,7 @@ SUSPICIOUS_COMPUTING_INT_DICT = [
     },
     # 128-bits
     {
-        "number": -pow(2, 127),
+        "number": -170141183460469231731687303715884105728,
         "equivalent": "-(2^127)",
         "location": "lowest",
         "sign": "a signed",
@@ -281,7 +344,7 @@ SUSPICIOUS_COMPUTING_INT_DICT = [
         "minmax": "min",
     },
     {
-        "number": pow(2, 127) - 1,
+        "number": 170141183460469231731687303715884105727,
         "equivalent": "2^127-1",
         "location": "highest",
         "sign": "a signed",
@@ -289,7 +352,7 @@ SUSPICIOUS_COMPUTING_INT_DICT = [
         "minmax": "max",
     },
     {
-        "number": pow(2, 128) - 1,
+        "number": 340282366920938463463374607431768211455,
         "equivalent": "2^128-1",
         "location": "highest",
         "sign": "an unsigned",
@@ -299,17 +362,34 @@ SUSPICIOUS_COMPUTING_INT_DICT = [
 ]
 
 
+_BY_NUMBER = {x['number']: x for x in SUSPICIOUS_COMPUTING_INT_DICT}
+_ALL_NINES = frozenset([99, 999, 9999, 99999, 999999, 9999999])
+_SENTINELS = _ALL_NINES | _BY_NUMBER.keys()
+
+
 class SuspiciousNumbersCheck(_BaseNumericExploration):
 
-    @property
-    def name(self):
-        return "Suspicious numers check"
+    name = "Suspicious numers check"
 
     def _explore(self, srs):
-        vcounts = srs.pdexplore['vcounts']
-        for x in SUSPICIOUS_COMPUTING_INT_DICT:
-            n = x['number']
-            if n in vcounts:
+        store = srs.pdexplore
+        vcounts = store['vcounts']
+        if 'moments' in store:
+            dmin, dmax = store['moments'][5:7]
+        elif len(vcounts) > 0:
+            dmin, dmax = vcounts.index.min(), vcounts.index.max()
+        else:
+            dmin, dmax = np.nan, np.nan
+        # sentinels occurring in the data; those outside its range are ruled
+        # out without looking them up in the value counts index
+        hits = {
+            n for n in _SENTINELS
+            if dmin <= n <= dmax and n in vcounts
+        }
+        count = len(srs)
+        for n in [n for n in _BY_NUMBER if n in hits or n == count]:
+            x = _BY_NUMBER[n]
+            if n in hits:
                 warning(
                     f"{n:,} found {vcounts[n]} times. It is suspicious, as it"
                     f" is exactly {x['equivalent']}; i.e. the {x['location']} "
@@ -319,7 +399,7 @@ class SuspiciousNumbersCheck(_BaseNumericExploration):
                     "in many programming language. The appearance of the "
                     "number may reflect an error, overflow condition or "
                     "missing value.")
-            if len(srs) == n:
+            if n == count:
                 warning(
                     f"Series length is {n:,}. It is suspicious, as it"
                     f" is exactly {x['equivalent']}; i.e. the {x['location']} "
@@ -329,11 +409,10 @@ class SuspiciousNumbersCheck(_BaseNumericExploration):
                     "in many programming language. In the case of series "
                     "length, it can imply the dataset itself was trimmed or "
                     "sliced.")
-        for n in [99, 999, 9999, 99999, 999999, 9999999]:
-            if n in vcounts:
-                print(
-                    f"{n:,} found {vcounts[n]} times. This might be suspicious"
-                    ", as all-9 numbers are often used as sentinel values.")
+        for n in sorted(hits & _ALL_NINES):
+            print(
+                f"{n:,} found {vcounts[n]} times. This might be suspicious"
+                ", as all-9 numbers are often used as sentinel values.")
 
 
 DEFAULT_NUMERIC_EXPLORATIONS_ORDER = [
@@ -345,7 +424,112 @@ DEFAULT_NUMERIC_EXPLORATIONS_ORDER = [
 ]
 
 
+# caps the number of cells reduced at once, bounding the size of temporaries
+FRAME_STATS_BLOCK_CELLS = 2 ** 22
+
+
+def precompute_numeric_stats(df, positions=None):
+    """Computes basic statistics of all numeric columns of a dataframe at once.
+
+    Instead of scanning each column separately, blocks of numeric columns are
+    reduced together with vectorized 2-D numpy reductions.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe to compute statistics for.
+    positions : iterable of int, optional
+        The positions of the numeric columns to compute statistics for.
+        Defaults to the positions of all numeric columns.
+
+    Returns
+    -------
+    dict
+        A dict mapping the position of each numeric column to a dict of its
+        statistics, keyed like the pdexplore store of a series, so they can
+        be reused by exploration stages.
+    """
+    if positions is None:
+        positions = [
+            pos for pos, dtype in enumerate(df.dtypes)
+            if is_numeric_dtype(dtype)
+        ]
+    num_pos = list(positions)
+    block_size = max(1, FRAME_STATS_BLOCK_CELLS // max(len(df), 1))
+    stats = {}
+    for start in range(0, len(num_pos), block_size):
+        block = num_pos[start:start + block_size]
+        arr = df.iloc[:, block].to_numpy(dtype=np.float64, na_value=np.nan)
+        n, mean, m2, m3, m4, dmin, dmax, median, mad_ = nan_moments_2d(arr)
+        for i, pos in enumerate(block):
+            stats[pos] = {
+                'moments': (
+                    int(n[i]), float(mean[i]), float(m2[i]), float(m3[i]),
+                    float(m4[i]), float(dmin[i]), float(dmax[i]),
+                ),
+                'median': float(median[i]),
+                'mad': float(mad_[i]),
+            }
+    return stats
+
+
+def _non_null_values(srs):
+    """Returns the non-null values of a numeric series as an ndarray.
+
+    Numeric series are of numpy integer or float dtypes (see
+    is_numeric_dtype), and only floats can hold missing values.
+    """
+    nona = np.ascontiguousarray(srs.to_numpy())
+    store = getattr(srs, 'pdexplore', {})
+    # no need to scan for missing values if the general exploration has
+    # already found them (or found there are none), and only copy the data
+    # if there are missing values to drop
+    if store.get('na_mask') is not None:
+        return nona[~store['na_mask']]
+    if nona.dtype.kind == 'f' and store.get('count_na') != 0:
+        na_mask = np.isnan(nona)
+        if na_mask.any():
+            nona = nona[~na_mask]
+    return nona
+
+
+# store keys written by numeric explorations, cleared before every run
+NUMERIC_STORE_KEYS = [
+    'numeric_dtype', 'nona', 'nona_len', 'moments', 'median', 'mad',
+    'skewness', 'skew_zscore', 'skew_pval', 'normal_skewness', 'shapiro_stat',
+    'shapiro_pval', 'shapiro_normal', 'dag_stat', 'dag_pval',
+    'dagostino_normal',
+]
+
+
 def run_numeric_exploration_pipeline(srs):
+    try:
+        store = srs.pdexplore
+    except AttributeError:
+        store = srs.pdexplore = {}
+    # stats left by an earlier run may no longer hold for the data; only
+    # stats precomputed for this very run (by dataframe explorations, under
+    # the 'precomputed' key) are reused, and only once
+    for key in NUMERIC_STORE_KEYS:
+        store.pop(key, None)
+    store.update(store.pop('precomputed', {}))
+    if not series_is_numeric(srs):
+        return
+    if ('moments' in store and 'median' in store
+            and store['moments'][0] > SHAPIRO_MAX_N):
+        # the only stage still needing the values themselves is the
+        # Shapiro-Wilk test, which is skipped for this many values
+        SeriesExploration.save(srs, 'nona_len', store['moments'][0])
+    else:
+        # non-null values are computed once, and shared by all stages; as
+        # all stats kernels compute in float64, they are also cast just once
+        nona = np.ascontiguousarray(_non_null_values(srs), dtype=np.float64)
+        SeriesExploration.save(srs, 'nona', nona)
+        SeriesExploration.save(srs, 'nona_len', len(nona))
+    # value counts are usually computed by the general exploration
+    if 'vcounts' not in store:
+        SeriesExploration.save(
+            srs, 'vcounts', srs.value_counts(sort=False))
     stages = []
     for clas in DEFAULT_NUMERIC_EXPLORATIONS_ORDER:
         stages.append(clas())
@@ -0,0 +1,237 @@
+"""Fast statistics kernels for pdexplore.
+
+All statistics are derived from a single pass over the data, accumulating
+its first four central moments. If numba is installed, kernels are JIT
+compiled (and cached on disk); otherwise, vectorized numpy code is used.
+"""
+
+import math
+import warnings
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+# scipy.stats.norm.ppf(0.75); scales the MAD to the std of normal data
+MAD_NORMAL_CONSTANT = 0.6744897501960817
+
+
+def _moments_single_pass(x):
+    """Computes the moments of the given non-empty, NaN-free array.
+
+    Uses Terriberry's online update of central moment sums, so the data is
+    read exactly once.
+
+    Returns
+    -------
+    tuple
+        A (n, mean, m2, m3, m4, min, max) tuple, where m2, m3 and m4 are the
+        sums of the second, third and fourth powers of deviations from the
+        mean.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    m3 = 0.0
+    m4 = 0.0
+    dmin = x[0]
+    dmax = x[0]
+    for val in x:
+        n1 = n
+        n += 1
+        delta = val - mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        mean += delta_n
+        m4 += (term1 * delta_n2 * (n * n - 3 * n + 3)
+               + 6 * delta_n2 * m2 - 4 * delta_n * m3)
+        m3 += term1 * delta_n * (n - 2) - 3 * delta_n * m2
+        m2 += term1
+        if val < dmin:
+            dmin = val
+        if val > dmax:
+            dmax = val
+    return n, mean, m2, m3, m4, dmin, dmax
+
+
+def _moments_vectorized(x):
+    """A numpy equivalent of _moments_single_pass, used without numba."""
+    mean = x.mean()
+    dev = x - mean
+    dev2 = dev * dev
+    return (
+        x.shape[0], mean, dev2.sum(), (dev2 * dev).sum(), (dev2 * dev2).sum(),
+        x.min(), x.max(),
+    )
+
+
+def _mad(x, med):
+    """Returns the median absolute deviation of an array with the given median.
+
+    The MAD is normalized to be a consistent estimator of the standard
+    deviation of normally distributed data, as in statsmodels.robust.mad.
+    """
+    return np.median(np.abs(x - med)) / MAD_NORMAL_CONSTANT
+
+
+if njit is None:  # pragma: no cover
+    moments = _moments_vectorized
+    mad = _mad
+else:
+    # no fastmath, as it assumes there are no infinite values in the data
+    _moments_jit = njit(cache=True)(_moments_single_pass)
+    mad = njit(cache=True)(_mad)
+
+    def moments(x):
+        """Computes the moments of the given non-empty, NaN-free array.
+
+        See _moments_single_pass for the output format.
+        """
+        res = _moments_jit(x)
+        # an infinite value makes the online update compute inf - inf, so
+        # such data is handled by the vectorized code, yielding an inf mean
+        if not math.isfinite(res[1]):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                return _moments_vectorized(x)
+        return res
+
+
+def nan_moments_2d(arr):
+    """Computes the moments, median and MAD of every column of a 2-D array.
+
+    NaN values are ignored, and all-NaN columns yield NaN statistics.
+
+    Returns
+    -------
+    tuple
+        A (n, mean, m2, m3, m4, min, max, median, mad) tuple of 1-D arrays,
+        holding the statistics of each column, with n to max in the same
+        format as the moments kernel uses.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        nans = np.isnan(arr)
+        n = arr.shape[0] - np.count_nonzero(nans, axis=0)
+        mean = np.nanmean(arr, axis=0)
+        dmin = np.nanmin(arr, axis=0)
+        dmax = np.nanmax(arr, axis=0)
+        median = np.nanmedian(arr, axis=0)
+        mad_ = np.nanmedian(np.abs(arr - median), axis=0)
+        mad_ /= MAD_NORMAL_CONSTANT
+        dev = arr - mean
+        dev[nans] = 0
+        dev2 = dev * dev
+        m2 = dev2.sum(axis=0)
+        m3 = (dev2 * dev).sum(axis=0)
+        m4 = (dev2 * dev2).sum(axis=0)
+        # sums over no values at all are 0; they are NaN like all others
+        m2, m3, m4 = (np.where(n > 0, m, np.nan) for m in (m2, m3, m4))
+    return n, mean, m2, m3, m4, dmin, dmax, median, mad_
+
+
+def std(n, m2):
+    """Returns the sample standard deviation (with ddof=1)."""
+    return math.sqrt(m2 / (n - 1))
+
+
+def skewness(n, m2, m3):
+    """Returns the biased sample skewness, as in scipy.stats.skew."""
+    if m2 == 0:
+        return math.nan
+    return math.sqrt(n) * m3 / m2 ** 1.5
+
+
+def kurtosis(n, m2, m4):
+    """Returns the biased Pearson kurtosis, as in scipy.stats.kurtosis."""
+    if m2 == 0:
+        return math.nan
+    return n * m4 / (m2 * m2)
+
+
+def _two_sided_pval(zscore):
+    return math.erfc(abs(zscore) / math.sqrt(2))
+
+
+def skewtest(skwns, n):
+    """Tests whether the skewness differs from that of a normal distribution.
+
+    Follows scipy.stats.skewtest, deriving the D'Agostino z-score from the
+    sample skewness and size alone.
+
+    Returns
+    -------
+    tuple
+        A (z-score, two-sided p-value) tuple.
+    """
+    y = skwns * math.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+    beta2 = (3.0 * (n * n + 27 * n - 70) * (n + 1) * (n + 3)
+             / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9)))
+    w2 = -1 + math.sqrt(2 * (beta2 - 1))
+    delta = 1 / math.sqrt(0.5 * math.log(w2))
+    alpha = math.sqrt(2.0 / (w2 - 1))
+    # like scipy, a skewness of exactly 0 is treated as y = 1
+    if y == 0:
+        y = 1.0
+    zscore = delta * math.asinh(y / alpha)
+    return zscore, _two_sided_pval(zscore)
+
+
+def kurtosistest(kurt, n):
+    """Tests whether the kurtosis differs from that of a normal distribution.
+
+    Follows scipy.stats.kurtosistest, deriving the Anscombe-Glynn z-score
+    from the sample (Pearson) kurtosis and size alone.
+
+    Returns
+    -------
+    tuple
+        A (z-score, two-sided p-value) tuple.
+    """
+    expected = 3.0 * (n - 1) / (n + 1)
+    varb2 = (24.0 * n * (n - 2) * (n - 3)
+             / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5)))
+    x = (kurt - expected) / math.sqrt(varb2)
+    sqrtbeta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9))
+                 * math.sqrt((6.0 * (n + 3) * (n + 5))
+                             / (n * (n - 2) * (n - 3))))
+    a = 6.0 + 8.0 / sqrtbeta1 * (
+        2.0 / sqrtbeta1 + math.sqrt(1 + 4.0 / (sqrtbeta1 ** 2)))
+    term1 = 1 - 2 / (9.0 * a)
+    denom = 1 + x * math.sqrt(2 / (a - 4.0))
+    if denom == 0 or math.isnan(denom):
+        return math.nan, math.nan
+    term2 = math.copysign(
+        ((1 - 2.0 / a) / abs(denom)) ** (1 / 3.0), denom)
+    zscore = (term1 - term2) / math.sqrt(2 / (9.0 * a))
+    return zscore, _two_sided_pval(zscore)
+
+
+def normaltest(n, m2, m3, m4, skew_zscore=None):
+    """D'Agostino and Pearson's K^2 test for normality, from data moments.
+
+    Follows scipy.stats.normaltest. As the statistic is chi-squared
+    distributed with two degrees of freedom, its p-value is exp(-K^2 / 2).
+
+    Parameters
+    ----------
+    n, m2, m3, m4 : int, float
+        The data moments, as returned by the moments kernel.
+    skew_zscore : float, optional
+        The skew test z-score of the data, if already computed.
+
+    Returns
+    -------
+    tuple
+        A (K^2 statistic, p-value) tuple.
+    """
+    if skew_zscore is None:
+        skew_zscore, _ = skewtest(skewness(n, m2, m3), n)
+    kurt_zscore, _ = kurtosistest(kurtosis(n, m2, m4), n)
+    stat = skew_zscore * skew_zscore + kurt_zscore * kurt_zscore
+    return stat, math.exp(-stat / 2)
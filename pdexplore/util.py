@@ -1,25 +1,27 @@
 """Utility functions for pdexplore."""
 
 import os
-import time
+import sys
+import datetime
+import functools
+import contextlib
 
 import colored
-from colored import stylize
 
 
 def nice_time_str():
-    """Returns current time as a nice string."""
-    gt = time.gmtime(time.time())
-    return (f'{gt.tm_year}-{gt.tm_mon:02}-{gt.tm_mday:02}_'
-            f'{gt.tm_hour:02}-{gt.tm_min:02}-{gt.tm_sec:02}')
+    """Returns current UTC time as a nice string."""
+    return datetime.datetime.now(datetime.timezone.utc).strftime(
+        '%Y-%m-%d_%H-%M-%S')
 
 
-def get_output_fpath(output_fpath, label=None):
+def get_output_fpath(output_fpath, label=None, ext='txt'):
     if os.path.isdir(output_fpath):
         nice_time = nice_time_str()
-        fname = f'pdexplore_{label}_{nice_time}.txt'
+        fname = f'pdexplore_{label}_{nice_time}.{ext}'
         return os.path.join(output_fpath, fname)
-    elif os.path.isfile(output_fpath):
+    elif os.path.isdir(os.path.dirname(output_fpath) or os.curdir):
+        # an existing file, or a new one in an existing directory
         return output_fpath
     else:
         raise ValueError(
@@ -28,6 +30,8 @@ def get_output_fpath(output_fpath, label=None):
 
 PRINT_TO_SCREEN = True
 OUTPUT_F = None
+OUTPUT_BUFFER = None
+BATCHING = False
 
 
 def set_printing_to_screen(val):
@@ -35,25 +39,100 @@ def set_printing_to_screen(val):
     PRINT_TO_SCREEN = val
 
 
+def is_printing_to_screen():
+    return PRINT_TO_SCREEN
+
+
 def set_output_f(f_obj):
     global OUTPUT_F
     OUTPUT_F = f_obj
 
 
+def set_output_buffer(buffer):
+    """Diverts all output into the given list; stops diverting if None."""
+    global OUTPUT_BUFFER
+    OUTPUT_BUFFER = buffer
+
+
+def replay(records):
+    """Prints output records collected by an output buffer, in order.
+
+    All records are emitted together, with a single write to screen and a
+    single write to the output file.
+    """
+    if OUTPUT_BUFFER is not None:
+        OUTPUT_BUFFER.extend(records)
+        return
+    if not records:
+        return
+    if PRINT_TO_SCREEN:
+        sys.stdout.write(''.join(
+            _stylize(string, color, attr) + '\n'
+            for string, color, attr in records))
+    if OUTPUT_F:
+        OUTPUT_F.write(''.join(string + '\n' for string, _, _ in records))
+
+
+@contextlib.contextmanager
+def batched_output():
+    """Batches all output printed within the context.
+
+    Batched output is emitted at once when the context exits, or when
+    flush_output() is called. If output is already being diverted into an
+    output buffer, it keeps going there.
+    """
+    global OUTPUT_BUFFER, BATCHING
+    if OUTPUT_BUFFER is not None:
+        yield
+        return
+    OUTPUT_BUFFER = []
+    BATCHING = True
+    try:
+        yield
+    finally:
+        records = OUTPUT_BUFFER
+        OUTPUT_BUFFER = None
+        BATCHING = False
+        replay(records)
+
+
+def flush_output():
+    """Emits all output batched so far; does nothing if not batching."""
+    global OUTPUT_BUFFER
+    if BATCHING:
+        records, OUTPUT_BUFFER = OUTPUT_BUFFER, None
+        replay(records)
+        OUTPUT_BUFFER = []
+
+
 def cstr(s, color='black'):
     return f"<text style=color:{color}>{s}</text>"
 
 
+@functools.lru_cache(maxsize=32)
+def _style(color=None, attr=None):
+    """Returns the (prefix, suffix) ANSI codes styling text as given."""
+    prefix = ''
+    if color:
+        prefix += colored.fg(color)
+    if attr:
+        prefix += colored.attr(attr)
+    if not prefix:
+        return '', ''
+    return prefix, colored.attr('reset')
+
+
+def _stylize(string, color=None, attr=None):
+    prefix, suffix = _style(color, attr)
+    return f"{prefix}{string}{suffix}"
+
+
 def custom_print(string, color=None, attr=None):
+    if OUTPUT_BUFFER is not None:
+        OUTPUT_BUFFER.append((string, color, attr))
+        return
     if PRINT_TO_SCREEN:
-        if color and attr:
-            print(stylize(string, colored.fg(color), colored.attr(attr)))
-        elif color:
-            print(stylize(string, colored.fg(color)))
-        elif attr:
-            print(stylize(string, colored.attr(attr)))
-        else:
-            print(string)
+        sys.stdout.write(_stylize(string, color, attr) + '\n')
     if OUTPUT_F:
         OUTPUT_F.write(string+'\n')
 
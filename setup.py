@@ -9,8 +9,8 @@ import versioneer
 
 INSTALL_REQUIRES = [
     'numpy',
+    'pandas',
     'scipy>=1.2',
-    'statsmodels',
     'colored',
     'seaborn',
 ]
@@ -40,6 +40,8 @@ setuptools.setup(
     install_requires=INSTALL_REQUIRES,
     extras_require={
         'test': TEST_REQUIRES + INSTALL_REQUIRES,
+        'numba': ['numba'],
+        'feather': ['pyarrow'],
     },
     # entry_points='''
     #     [console_scripts]
@@ -0,0 +1,159 @@
+"""Tests for the exploration drivers of pdexplore."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pdexplore as pde
+
+
+def test_explore_series_twice_uses_fresh_stats(capsys):
+    srs = pd.Series([1., np.nan, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])
+    pde.explore_series(srs)
+    srs.fillna(100.0, inplace=True)
+    pde.explore_series(srs)
+    out = capsys.readouterr().out
+    second_run = out[out.rindex('Starting to explore series'):]
+    assert "0.00% missing values" in second_run
+    assert "max=100.00" in second_run
+    assert srs.pdexplore['nona_len'] == 12
+
+
+def test_rerunning_explorations_on_a_kept_store_uses_fresh_stats(capsys):
+    from pdexplore.general import general_exploration
+    from pdexplore.numeric import run_numeric_exploration_pipeline
+    srs = pd.Series([1., np.nan, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])
+    general_exploration(srs)
+    run_numeric_exploration_pipeline(srs)
+    srs.fillna(100.0, inplace=True)
+    capsys.readouterr()
+    # the store is kept between explorations here, on purpose
+    general_exploration(srs)
+    run_numeric_exploration_pipeline(srs)
+    out = capsys.readouterr().out
+    store = srs.pdexplore
+    assert store['na_mask'] is None
+    assert store['nona_len'] == 12
+    assert store['moments'][6] == 100.0
+    assert store['median'] == 7.5
+    assert "0.00% missing values" in out
+    assert "max=100.00" in out
+    assert "Median=7.50" in out
+
+
+def _mixed_df():
+    rng = np.random.default_rng(0)
+    n = 60
+    return pd.DataFrame({
+        'ints': rng.integers(0, 10, n),
+        'floats': np.where(rng.random(n) < .2, np.nan, rng.normal(size=n)),
+        'strs': rng.choice(['a', 'b', 'c'], n),
+        'when': pd.date_range(
+            '2020-01-01', periods=n, freq='h', tz='US/Eastern'),
+    })
+
+
+def _explore_to_text(tmp_path, df, **kwargs):
+    fpath = tmp_path / f"out_{kwargs.get('n_jobs', 1)}.txt"
+    pde.explore(df, output_path=str(fpath), silent=True, **kwargs)
+    return fpath.read_text()
+
+
+def test_parallel_explore_matches_sequential(tmp_path):
+    df = _mixed_df()
+    sequential = _explore_to_text(tmp_path, df, n_jobs=1)
+    parallel = _explore_to_text(tmp_path, df, n_jobs=2)
+    assert parallel == sequential
+    assert ", US/Eastern]" in parallel
+
+
+def test_fast_mode_setting_reaches_spawned_workers(tmp_path, monkeypatch):
+    import multiprocessing
+    from pdexplore import numeric
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'a': rng.exponential(size=200), 'b': rng.exponential(size=200)})
+    monkeypatch.setattr(numeric, 'FAST_MODE', False)
+    start_method = multiprocessing.get_start_method()
+    multiprocessing.set_start_method('spawn', force=True)
+    try:
+        out = _explore_to_text(tmp_path, df, n_jobs=2)
+    finally:
+        multiprocessing.set_start_method(start_method, force=True)
+    assert "already rejected normality" not in out
+    assert out.count("Performing the Shapiro-Wilk test") == 2
+
+
+def test_complex_and_timedelta_columns_skip_numeric_exploration(capsys):
+    df = pd.DataFrame({
+        'z': np.arange(20) * (1 + 2j),
+        'dt': pd.to_timedelta(np.arange(20), unit='s'),
+    })
+    pde.explore(df)
+    for col in df:
+        pde.explore_series(df[col], label=col)
+    out = capsys.readouterr().out
+    assert out.count("Starting to explore series") == 4
+    assert "Starting numeric data exploration" not in out
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_feather_output_round_trip(tmp_path, n_jobs):
+    pytest.importorskip('pyarrow')
+    from pdexplore.core import STATS_COLUMNS
+    df = _mixed_df()
+    fpath = tmp_path / 'stats.feather'
+    pde.explore(
+        df, output_path=str(fpath), output_format='feather', silent=True,
+        n_jobs=n_jobs)
+    stats = pd.read_feather(fpath)
+    assert list(stats.columns) == STATS_COLUMNS
+    assert stats['column'].tolist() == list(df.columns)
+    # like Series.unique(), a missing value counts as a unique value
+    assert stats['n_unique'].tolist() == [
+        len(df[col].unique()) for col in df.columns]
+    floats = df['floats'].dropna()
+    row = stats.set_index('column').loc['floats']
+    assert row['n_na'] == df['floats'].isna().sum()
+    assert row['mean'] == pytest.approx(floats.mean())
+    assert row['std'] == pytest.approx(floats.std())
+    assert row['median'] == pytest.approx(floats.median())
+    assert stats.set_index('column')['mean'].isna().tolist() == [
+        False, False, True, True]
+
+
+def test_feather_output_requires_a_path():
+    with pytest.raises(ValueError):
+        pde.explore(_mixed_df(), output_format='feather')
+
+
+def _skip_df():
+    return pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6], 'c': [7, 8, 9]})
+
+
+@pytest.mark.parametrize('skip_lbl', [
+    ['a', 'b'],
+    np.array(['a', 'b']),
+    pd.Index(['a', 'b']),
+    pd.Series(['a', 'b']),
+    [['unhashable'], 'a', 'b'],
+], ids=['list', 'ndarray', 'index', 'series', 'unhashable'])
+def test_skip_lbl_array_likes(capsys, skip_lbl):
+    pde.explore(_skip_df(), skip_lbl=skip_lbl)
+    out = capsys.readouterr().out
+    assert "Skipping exploration of column a!" in out
+    assert "Skipping exploration of column b!" in out
+    assert "Starting to explore series c" in out
+    assert "Explortaion of 2 columns was skipped." in out
+
+
+@pytest.mark.parametrize('skip_cond', [
+    lambda col: col.name == 'a',
+    [lambda col: col.name == 'a', lambda col: col.name == 'b'],
+    np.array([lambda col: col.name == 'a', lambda col: col.name == 'b']),
+], ids=['callable', 'list', 'ndarray'])
+def test_skip_cond_array_likes(capsys, skip_cond):
+    pde.explore(_skip_df(), skip_cond=skip_cond)
+    out = capsys.readouterr().out
+    assert "Skipping exploration of column a!" in out
+    assert "Starting to explore series c" in out
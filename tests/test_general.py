@@ -0,0 +1,99 @@
+"""Tests for the general explorations of pdexplore."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdexplore.general import (
+    _count_values,
+    _most_frequent,
+)
+
+
+@pytest.mark.parametrize('dtype', [
+    np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint64])
+def test_count_values_of_integers_spanning_their_dtype(dtype):
+    info = np.iinfo(dtype)
+    values = np.array([info.min, info.max, info.min + 1] * 200, dtype=dtype)
+    srs = pd.Series(values)
+    uniques, counts, na_mask = _count_values(srs)
+    expected = srs.value_counts()
+    assert dict(zip(uniques.tolist(), counts.tolist())) == {
+        k: v for k, v in expected.items()}
+    assert na_mask is None or not na_mask.any()
+
+
+def test_count_values_with_missing_values():
+    srs = pd.Series([1.5, np.nan, 1.5, 2.0, np.nan])
+    uniques, counts, na_mask = _count_values(srs)
+    assert dict(zip(uniques.tolist(), counts.tolist())) == {1.5: 2, 2.0: 1}
+    assert na_mask.tolist() == [False, True, False, False, True]
+
+
+def _stable_top(counts, k):
+    return np.argsort(-counts, kind='stable')[:k]
+
+
+@pytest.mark.parametrize('counts', [
+    [5, 3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 1],
+    [1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 9],
+    [4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4],
+    [3, 1, 2],
+    [7],
+    [],
+], ids=['ties_at_kth', 'ties_around_kth', 'all_tied', 'few', 'one', 'none'])
+def test_most_frequent(counts):
+    counts = np.array(counts, dtype=np.intp)
+    assert _most_frequent(counts, 10).tolist() == (
+        _stable_top(counts, 10).tolist())
+
+
+def test_most_frequent_random_counts():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        counts = rng.integers(1, 6, rng.integers(1, 40))
+        assert _most_frequent(counts, 10).tolist() == (
+            _stable_top(counts, 10).tolist())
+
+
+def test_most_frequent_of_bincount_and_factorize_ordered_counts():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 30, 300)
+    # small-range integers are counted by bincount, in order of value, while
+    # floats are factorized, in order of appearance
+    for srs in [pd.Series(values), pd.Series(values.astype(np.float64))]:
+        uniques, counts, _ = _count_values(srs)
+        top = _most_frequent(counts, 10)
+        expected = pd.Series(counts, index=uniques).sort_values(
+            ascending=False, kind='stable')[:10]
+        assert list(uniques[top]) == list(expected.index)
+
+
+def test_value_counts_plot_closes_its_figures(monkeypatch):
+    matplotlib = pytest.importorskip('matplotlib')
+    matplotlib.use('Agg')
+    from matplotlib import pyplot as plt
+    from pdexplore.general import general_exploration
+    from pdexplore.util import set_printing_to_screen
+    shown = []
+    monkeypatch.setattr(plt, 'show', lambda: shown.append(
+        [t.get_text() for t in plt.gca().get_yticklabels()]))
+    set_printing_to_screen(True)
+    plt.close('all')
+    labels = ['a' * 30] * 5 + ['b'] * 3 + ['c'] * 3
+    general_exploration(pd.Series(labels), label='letters')
+    assert plt.get_fignums() == []
+    assert shown == [[
+        f"{'a' * 18}... (45.45%)", 'b (27.27%)', 'c (27.27%)']]
+
+
+def test_plotting_libraries_are_imported_lazily():
+    import subprocess
+    import sys
+    code = (
+        "import sys, pdexplore; "
+        "print('seaborn' in sys.modules, 'matplotlib.pyplot' in sys.modules)")
+    out = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True,
+        check=True).stdout
+    assert out.split() == ['False', 'False']
@@ -0,0 +1,104 @@
+"""Tests for the numeric explorations of pdexplore."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdexplore.numeric import (
+    SUSPICIOUS_COMPUTING_INT_DICT,
+    run_numeric_exploration_pipeline,
+)
+from pdexplore.util import (
+    custom_print as print,
+    warning,
+)
+
+
+def _reference_suspicious_numbers_check(srs):
+    """The original, straightforward suspicious numbers check."""
+    vcounts = srs.pdexplore['vcounts']
+    for x in SUSPICIOUS_COMPUTING_INT_DICT:
+        n = x['number']
+        if n in vcounts:
+            warning(
+                f"{n:,} found {vcounts[n]} times. It is suspicious, as it"
+                f" is exactly {x['equivalent']}; i.e. the {x['location']} "
+                f"number that can be represented by {x['sign']} "
+                f"{x['bits']}-bit binary number. It is therefore the "
+                f"{x['minmax']} value for variables declared as integers "
+                "in many programming language. The appearance of the "
+                "number may reflect an error, overflow condition or "
+                "missing value.")
+        if len(srs) == n:
+            warning(
+                f"Series length is {n:,}. It is suspicious, as it"
+                f" is exactly {x['equivalent']}; i.e. the {x['location']} "
+                f"number that can be represented by {x['sign']} "
+                f"{x['bits']}-bit binary number. It is therefore the "
+                f"{x['minmax']} value for variables declared as integers "
+                "in many programming language. In the case of series "
+                "length, it can imply the dataset itself was trimmed or "
+                "sliced.")
+    for n in [99, 999, 9999, 99999, 999999, 9999999]:
+        if n in vcounts:
+            print(
+                f"{n:,} found {vcounts[n]} times. This might be suspicious"
+                ", as all-9 numbers are often used as sentinel values.")
+
+
+def _limits(dtype):
+    info = np.iinfo(dtype)
+    return pd.Series(
+        np.array([info.min, info.max, 0, 7, info.max, 3], dtype=dtype))
+
+
+SUSPICIOUS_CASES = {
+    **{np.dtype(dtype).name: _limits(dtype) for dtype in [
+        np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32,
+        np.int64, np.uint64]},
+    'floats': pd.Series([127.0, 255.0, np.nan, 999.0, -32768.0, 2.5]),
+    'all_nines': pd.Series([99, 999, 9999, 99999, 999999, 9999999, 1, 99]),
+    'length_127': pd.Series(np.arange(1000, 1127)),
+    'length_255': pd.Series(np.arange(255, dtype=np.float64)),
+    'length_65535': pd.Series(np.zeros(65535, dtype=np.int8)),
+    'few_values': pd.Series([127, 255, np.nan]),
+    'all_missing': pd.Series([np.nan] * 3),
+    'none_suspicious': pd.Series([1.5, 2.5, 3.5, 4.5, 5.5]),
+}
+
+
+def _suspicious_lines(out):
+    return [
+        line for line in out.splitlines()
+        if ' found ' in line or line.startswith('Series length is')
+    ]
+
+
+@pytest.mark.parametrize(
+    'srs', SUSPICIOUS_CASES.values(), ids=SUSPICIOUS_CASES)
+def test_suspicious_numbers_check_matches_reference(capsys, srs):
+    run_numeric_exploration_pipeline(srs)
+    actual = _suspicious_lines(capsys.readouterr().out)
+    _reference_suspicious_numbers_check(srs)
+    expected = _suspicious_lines(capsys.readouterr().out)
+    assert actual == expected
+
+
+def test_suspicious_numbers_warnings_order(capsys):
+    srs = pd.Series(np.array([255] * 3 + [-128, 99] + [0] * 250))
+    assert len(srs) == 255
+    run_numeric_exploration_pipeline(srs)
+    lines = _suspicious_lines(capsys.readouterr().out)
+    assert [line.split('. ')[0] for line in lines] == [
+        "-128 found 1 times",
+        "255 found 3 times",
+        "Series length is 255",
+        "99 found 1 times",
+    ]
+
+
+@pytest.mark.parametrize('case', [
+    'uint64', 'all_nines', 'length_127', 'few_values'])
+def test_suspicious_numbers_are_found(capsys, case):
+    run_numeric_exploration_pipeline(SUSPICIOUS_CASES[case])
+    assert _suspicious_lines(capsys.readouterr().out)
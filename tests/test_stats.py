@@ -0,0 +1,127 @@
+"""Tests for the statistics kernels of pdexplore."""
+
+import math
+import warnings
+
+import numpy as np
+import pytest
+import scipy.stats
+
+from pdexplore import stats
+
+
+SIZES = [8, 20, 100, 1000, 100000]
+
+MOMENTS_FUNCS = {
+    'default': stats.moments,
+    'vectorized': stats._moments_vectorized,
+}
+
+
+def _sample(n, dist):
+    rng = np.random.default_rng(n)
+    if dist == 'normal':
+        return rng.normal(loc=3, scale=2, size=n)
+    return rng.exponential(size=n)
+
+
+@pytest.fixture(params=[
+    (n, dist) for n in SIZES for dist in ['normal', 'exponential']],
+    ids=lambda p: f"{p[1]}-{p[0]}")
+def sample(request):
+    return _sample(*request.param)
+
+
+@pytest.mark.parametrize('func', MOMENTS_FUNCS.values(), ids=MOMENTS_FUNCS)
+def test_moments(sample, func):
+    n, mean, m2, m3, m4, dmin, dmax = func(sample)
+    dev = sample - sample.mean()
+    assert n == len(sample)
+    assert mean == pytest.approx(sample.mean(), rel=1e-12)
+    assert m2 == pytest.approx((dev ** 2).sum(), rel=1e-9)
+    assert m3 == pytest.approx((dev ** 3).sum(), rel=1e-7, abs=1e-7 * n)
+    assert m4 == pytest.approx((dev ** 4).sum(), rel=1e-9)
+    assert (dmin, dmax) == (sample.min(), sample.max())
+    assert stats.std(n, m2) == pytest.approx(sample.std(ddof=1))
+    assert stats.skewness(n, m2, m3) == pytest.approx(
+        scipy.stats.skew(sample), rel=1e-6, abs=1e-9)
+    assert stats.kurtosis(n, m2, m4) == pytest.approx(
+        scipy.stats.kurtosis(sample, fisher=False), rel=1e-9)
+
+
+def test_skewtest(sample):
+    n, _, m2, m3, _, _, _ = stats.moments(sample)
+    zscore, pval = stats.skewtest(stats.skewness(n, m2, m3), n)
+    expected = scipy.stats.skewtest(sample)
+    assert zscore == pytest.approx(expected.statistic, rel=1e-6, abs=1e-9)
+    assert pval == pytest.approx(expected.pvalue, rel=1e-6, abs=1e-12)
+
+
+def test_skewtest_of_zero_skewness_matches_scipy():
+    sample = np.arange(1, 892, dtype=np.float64)
+    zscore, pval = stats.skewtest(0.0, len(sample))
+    expected = scipy.stats.skewtest(sample)
+    assert zscore == pytest.approx(expected.statistic)
+    assert pval == pytest.approx(expected.pvalue)
+
+
+def test_normaltest(sample):
+    n, _, m2, m3, m4, _, _ = stats.moments(sample)
+    with warnings.catch_warnings():
+        # scipy warns the kurtosis test is inaccurate for n < 20
+        warnings.simplefilter('ignore', UserWarning)
+        expected = scipy.stats.normaltest(sample)
+    stat, pval = stats.normaltest(n, m2, m3, m4)
+    assert stat == pytest.approx(expected.statistic, rel=1e-6)
+    assert pval == pytest.approx(expected.pvalue, rel=1e-6, abs=1e-12)
+    # reusing the skew test z-score gives the same result
+    skew_zscore, _ = stats.skewtest(stats.skewness(n, m2, m3), n)
+    assert stats.normaltest(n, m2, m3, m4, skew_zscore=skew_zscore) == (
+        pytest.approx((stat, pval)))
+
+
+def test_mad(sample):
+    robust = pytest.importorskip('statsmodels.robust')
+    assert stats.mad(sample, np.median(sample)) == pytest.approx(
+        robust.mad(sample), rel=1e-9)
+
+
+@pytest.mark.parametrize('func', MOMENTS_FUNCS.values(), ids=MOMENTS_FUNCS)
+def test_moments_of_constant_data(func):
+    n, mean, m2, m3, m4, dmin, dmax = func(np.full(50, 7.0))
+    assert (n, mean, m2, dmin, dmax) == (50, 7.0, 0.0, 7.0, 7.0)
+    assert math.isnan(stats.skewness(n, m2, m3))
+    assert math.isnan(stats.kurtosis(n, m2, m4))
+    assert stats.mad(np.full(50, 7.0), 7.0) == 0
+
+
+def test_moments_of_data_with_infinite_values():
+    x = np.array([1, np.inf, 2, 3, 4, 5, 6, 7, 8, 9], dtype=np.float64)
+    n, mean, _, _, _, dmin, dmax = stats.moments(x)
+    assert n == 10
+    assert mean == np.inf
+    assert (dmin, dmax) == (1, np.inf)
+    n, mean, _, _, _, _, _ = stats.moments(np.array([1., np.inf, -np.inf]))
+    assert math.isnan(mean)
+
+
+def test_nan_moments_2d():
+    rng = np.random.default_rng(0)
+    arr = rng.normal(size=(1000, 4))
+    arr[rng.random(1000) < 0.3, 1] = np.nan
+    arr[:, 2] = 5.0
+    arr[:, 3] = np.nan
+    n, mean, m2, m3, m4, dmin, dmax, median, mad_ = stats.nan_moments_2d(arr)
+    for col in range(3):
+        values = arr[:, col][~np.isnan(arr[:, col])]
+        expected = stats._moments_vectorized(values)
+        actual = (n[col], mean[col], m2[col], m3[col], m4[col],
+                  dmin[col], dmax[col])
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9)
+        assert median[col] == np.median(values)
+        assert mad_[col] == pytest.approx(
+            stats.mad(values, np.median(values)), rel=1e-12)
+    # an all-NaN column yields NaN statistics
+    assert n[3] == 0
+    assert all(math.isnan(stat[3]) for stat in (
+        mean, m2, m3, m4, dmin, dmax, median, mad_))